@@ -1,5 +1,6 @@
-import machine
-
+# All devices below are created at boot, so every driver module imported
+# here is needed anyway; lazy loading via `from drivers import ...` would
+# not save anything. To make boot lighter, remove devices you don't use.
 from drivers.olab_esp32_robot_board import RobotBoard
 
 from drivers.olab_io_expander import PCF8574
@@ -19,9 +20,17 @@ expander = PCF8574(i2c, address=0x23)
 stepper1 = SM28BYJ48(expander[:4])
 stepper2 = SM28BYJ48(expander[:4])
 
-motor1 = L293DMotor(board.MOTOR_12EN, board.MOTOR_1A, board.MOTOR_2A)
-motor2 = L293DMotor(board.MOTOR_34EN, board.MOTOR_3A, board.MOTOR_4A)
+pin = board.pin_out
+
+motor1 = L293DMotor(
+    pin('MOTOR_12EN'), pin('MOTOR_1A'), pin('MOTOR_2A'),
+    pwm_factory=board.pwm,
+)
+motor2 = L293DMotor(
+    pin('MOTOR_34EN'), pin('MOTOR_3A'), pin('MOTOR_4A'),
+    pwm_factory=board.pwm,
+)
 
-servo1 = SG90(board.PWM1)
-servo2 = SG90(board.PWM2)
-servo3 = SG90(board.PWM3)
+servo1 = SG90(pwm=board.pwm('PWM1', freq=50))
+servo2 = SG90(pwm=board.pwm('PWM2', freq=50))
+servo3 = SG90(pwm=board.pwm('PWM3', freq=50))
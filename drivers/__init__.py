@@ -0,0 +1,56 @@
+"""
+OctopusLab drivers for MicroPython
+
+Driver classes are available as attributes of the package. Importing the
+package is cheap: a driver module is only imported when one of its classes
+is first looked up on the package. To defer loading until a driver is
+actually needed, look it up at the point of use:
+
+    import drivers
+
+    if want_servo:
+        servo = drivers.SG90(17)  # olab_servo is imported here
+
+Note that `from drivers import SG90` looks the class up (and so imports
+`olab_servo`) immediately.
+(The modules can still be imported directly, e.g. `drivers.olab_servo`.)
+"""
+
+_modules = {
+    'Board': 'olab_board',
+    'RobotBoard': 'olab_esp32_robot_board',
+    'NodeMCU': 'olab_esp8266_nodemcu',
+    'PCF8574': 'olab_io_expander',
+    'SM28BYJ48': 'olab_stepper',
+    'L293DMotor': 'olab_motor',
+    'SG90': 'olab_servo',
+    'PCA9685': 'olab_pwm_driver',
+    'PWMAllocator': 'olab_pwm_allocator',
+    'BatteryMonitor': 'olab_battery',
+    'MotionProgram': 'olab_motion',
+    'MotionPlayer': 'olab_motion',
+}
+
+
+def __getattr__(name):
+    if name.startswith('olab_'):
+        # A submodule. MicroPython's `from drivers import olab_x` looks up
+        # the attribute first, and an error raised here would propagate
+        # instead of the submodule being imported.
+        try:
+            value = __import__(__name__ + '.' + name, None, None, (name,))
+        except ImportError as e:
+            # Keep hasattr() working for modules that don't exist
+            raise AttributeError('{} ({})'.format(name, e))
+    else:
+        try:
+            module_name = _modules[name]
+        except KeyError:
+            raise AttributeError(name)
+        module = __import__(
+            __name__ + '.' + module_name, None, None, (name,),
+        )
+        value = getattr(module, name)
+    # Cache, so __getattr__ isn't called again for this name
+    globals()[name] = value
+    return value
@@ -0,0 +1,116 @@
+"""
+Background battery voltage monitor
+
+Reads an ADC periodically from a `machine.Timer`. Each reading is the sum
+of several samples (oversampling); the last few readings are kept in
+a preallocated ring buffer and averaged (moving average).
+
+`battery_voltage()` returns the current average; it does no I/O, so it's
+cheap to call from a main loop.
+
+If `on_low` is given, it is called with the voltage when it drops below
+`low_voltage`. It will be called again after the voltage rises above
+`low_voltage + hysteresis` and drops again.
+The callback is scheduled with `micropython.schedule`, so it may allocate
+memory.
+
+Example -- limit motor speed when the battery sags:
+
+    def on_low(voltage):
+        print('Low battery:', voltage)
+        motor1.speed_limit(0.5)
+
+    monitor = board.get_battery_monitor(on_low=on_low)
+    print(monitor.battery_voltage())
+
+The voltage is computed as `raw / max_raw * full_scale * divider`, where
+`full_scale` is the ADC's input voltage range and `divider` is the ratio of
+the voltage divider between the battery and the ADC pin.
+"""
+
+from array import array
+import machine
+import micropython
+
+
+class BatteryMonitor:
+    def __init__(
+        self, adc, timer,
+        *,
+        period_ms=100, oversample=8, window=16,
+        max_raw=4095, full_scale=3.6, divider=2,
+        low_voltage=3.4, hysteresis=0.1, on_low=None,
+    ):
+        self._adc = adc
+        self._timer = timer
+        self._period_ms = period_ms
+        self._oversample = oversample
+        self._window = window
+        self._buffer = array('L', [0] * window)
+        self._index = 0
+        self._sum = 0
+        self._low = False
+        self._on_low = on_low
+        # Volts per unit of the sum of all samples in the buffer
+        self._scale = full_scale * divider / max_raw / oversample / window
+        self._low_sum = int(low_voltage / self._scale)
+        self._ok_sum = int((low_voltage + hysteresis) / self._scale)
+        # Preallocate bound methods used from the timer
+        self._sample_callback = self._sample
+        self._notify_callback = self._notify
+        self.start()
+
+    def _read(self):
+        read = self._adc.read
+        total = 0
+        for _ in range(self._oversample):
+            total += read()
+        return total
+
+    def _sample(self, timer):
+        total = self._read()
+        buffer = self._buffer
+        index = self._index
+        self._sum += total - buffer[index]
+        buffer[index] = total
+        index += 1
+        if index >= self._window:
+            index = 0
+        self._index = index
+        if self._low:
+            if self._sum >= self._ok_sum:
+                self._low = False
+        elif self._sum < self._low_sum:
+            self._low = True
+            if self._on_low is not None:
+                micropython.schedule(self._notify_callback, None)
+
+    def _notify(self, arg):
+        self._on_low(self.battery_voltage())
+
+    def start(self):
+        """Start sampling; called automatically on creation"""
+        # Fill the buffer, so the average is valid from the start
+        total = self._read()
+        buffer = self._buffer
+        for i in range(self._window):
+            buffer[i] = total
+        self._index = 0
+        self._sum = total * self._window
+        self._timer.init(
+            period=self._period_ms, mode=machine.Timer.PERIODIC,
+            callback=self._sample_callback,
+        )
+
+    def stop(self):
+        self._timer.deinit()
+
+    def battery_voltage(self):
+        """Return the averaged voltage (no I/O is done)"""
+        return self._sum * self._scale
+
+    def is_low(self):
+        return self._low
+
+    def __repr__(self):
+        return '<BatteryMonitor {:.2f} V>'.format(self.battery_voltage())
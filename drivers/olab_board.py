@@ -0,0 +1,102 @@
+"""
+Common base for board pinout classes
+
+Subclasses define pins as upper-case int class attributes, e.g.:
+
+    class MyBoard(Board):
+        BUILT_IN_LED = 2
+
+Pins that differ between board versions are returned by `_version_pins`.
+The table mapping names to pin numbers is built once per board class and
+version.
+
+Pins returned by `pin_out` and `pin_in` are pooled: asking for the same
+pin again returns the same `machine.Pin` object. Asking for a pin that is
+already in use in a different mode raises ValueError -- this usually means
+two devices are wired to the same pin.
+Use `release_pin` to return a pin to the pool.
+"""
+
+import machine
+
+_pin_tables = {}
+
+
+def _add_class_pins(cls, table):
+    """Add pins defined on cls and its bases to table
+
+    Uses the class namespaces directly: dir() is slow on MicroPython.
+    """
+    if cls is object:
+        return
+    for base in cls.__bases__:
+        _add_class_pins(base, table)
+    for name, number in cls.__dict__.items():
+        if name.startswith('_') or not name.isupper():
+            continue
+        if isinstance(number, int):
+            table[name] = number
+
+
+class Board:
+    version = None
+
+    def __init__(self, version=None):
+        if version is not None:
+            self.version = version
+        self._pin_numbers = self._pin_table(self.version)
+        for name, number in self._version_pins(self.version).items():
+            setattr(self, name, number)
+        self._pins = {}
+
+    def _version_pins(self, version):
+        """Return a dict of pins that differ from the defaults in `version`"""
+        return {}
+
+    def _pin_table(self, version):
+        cls = type(self)
+        key = cls, version
+        try:
+            return _pin_tables[key]
+        except KeyError:
+            pass
+        table = {}
+        _add_class_pins(cls, table)
+        table.update(self._version_pins(version))
+        _pin_tables[key] = table
+        return table
+
+    def pin_number(self, name):
+        if isinstance(name, int):
+            return name
+        return self._pin_numbers[name]
+
+    def _claim(self, name, mode, pull=None):
+        number = self.pin_number(name)
+        try:
+            pin, pin_mode, pin_pull = self._pins[number]
+        except KeyError:
+            pass
+        else:
+            if pin_mode != mode or pin_pull != pull:
+                raise ValueError(
+                    'pin {} is already in use in a different mode'.format(name)
+                )
+            return pin
+        if pull is None:
+            pin = machine.Pin(number, mode)
+        else:
+            pin = machine.Pin(number, mode, pull)
+        self._pins[number] = pin, mode, pull
+        return pin
+
+    def pin_out(self, name):
+        return self._claim(name, machine.Pin.OUT)
+
+    def pin_in(self, name):
+        Pin = machine.Pin
+        return self._claim(name, Pin.IN, Pin.PULL_UP)
+
+    def release_pin(self, name):
+        """Remove a pin from the pool, so it can be used in another mode"""
+        self._pins.pop(self.pin_number(name), None)
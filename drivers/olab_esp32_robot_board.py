@@ -19,13 +19,22 @@ board.pin_out('PWM1')
 # Get an input pin:
 board.pin_in(board.ONE_WIRE)
 board.pin_in('ONE_WIRE')
+
+# Get a PWM output (sharing a timer with other 50 Hz outputs):
+board.pwm('PWM1', freq=50)
+
+# Monitor the LiPo battery in the background:
+board.get_battery_monitor().battery_voltage()
+
+Pins are pooled; see olab_board for details.
 """
 
-from micropython import const
 import machine
 
+from .olab_board import Board
 
-class RobotBoard:
+
+class RobotBoard(Board):
     # PINs on the ESP32 board
     BUILT_IN_LED = 2
     HALL_SENSOR = 8
@@ -70,47 +79,75 @@ class RobotBoard:
     I34 = 34
     I35 = 35
 
+    version = 2
     _i2c = None
+    _pwm_allocator = None
+    _battery_monitor = None
 
-    def __init__(self, version=2):
-        self.version = version
+    def _version_pins(self, version):
         if version <= 1:
-            # Update pins for the older version
-            self.WSLED = 13
-            self.MOTOR_34EN = 15
-
-    def pin_number(self, name):
-        if isinstance(name, int):
-            return name
-        else:
-            number = getattr(self, name)
-            if not isinstance(number, int):
-                raise KeyError(name)
-            return number
-
-    def pin_out(self, name):
-        number = self.pin_number(name)
-        Pin = machine.Pin
-        return Pin(number, Pin.OUT)
-
-    def pin_in(self, name):
-        number = self.pin_number(name)
-        Pin = machine.Pin
-        return Pin(number, Pin.IN, Pin.PULL_UP)
+            # Pins that differ on the older version
+            return {'WSLED': 13, 'MOTOR_34EN': 15}
+        return {}
 
     def get_i2c(self):
         if self._i2c is None:
             Pin = machine.Pin
             self._i2c = machine.I2C(
-                scl=Pin(self.I2C_SCL, Pin.OUT, Pin.PULL_UP),
-                sda=Pin(self.I2C_SDA, Pin.OUT, Pin.PULL_UP),
+                scl=self._claim(self.I2C_SCL, Pin.OUT, Pin.PULL_UP),
+                sda=self._claim(self.I2C_SDA, Pin.OUT, Pin.PULL_UP),
             )
         return self._i2c
 
+    def get_pwm_allocator(self, **kwargs):
+        """Get the board's PWM allocator; see olab_pwm_allocator
+
+        Keyword arguments (e.g. `max_channels=16, max_timers=8` for newer
+        firmware) are passed to `PWMAllocator`. They can only be given
+        before the allocator is created, i.e. before the first call to
+        this method or to `pwm()`.
+        """
+        if self._pwm_allocator is None:
+            from .olab_pwm_allocator import PWMAllocator
+            self._pwm_allocator = PWMAllocator(**kwargs)
+        elif kwargs:
+            raise ValueError('PWM allocator is already created')
+        return self._pwm_allocator
+
+    def pwm(self, pin, freq, duty=0):
+        """Get a PWM output, sharing timers with other same-frequency users
+
+        `pin` can be a name, number or machine.Pin. If it is None, a channel
+        of a PCA9685 added with `get_pwm_allocator().add_fallback()` is used.
+        Call `deinit()` on the result to free it.
+        """
+        if isinstance(pin, (int, str)):
+            pin = self.pin_out(pin)
+        return self.get_pwm_allocator().pwm(pin, freq, duty)
+
+    def get_battery_monitor(self, timer=None, **kwargs):
+        """Get a monitor of the voltage on ANALOG_IN; see olab_battery
+
+        The monitor is created and started on the first call, using the
+        given `machine.Timer` (Timer(0) by default) and keyword arguments
+        for `BatteryMonitor`. Later calls must not pass any arguments.
+        """
+        if self._battery_monitor is not None:
+            if timer is not None or kwargs:
+                raise ValueError('battery monitor is already created')
+        else:
+            from .olab_battery import BatteryMonitor
+            adc = machine.ADC(self._claim(self.ANALOG_IN, machine.Pin.IN))
+            adc.atten(machine.ADC.ATTN_11DB)
+            if timer is None:
+                timer = machine.Timer(0)
+            self._battery_monitor = BatteryMonitor(adc, timer, **kwargs)
+        return self._battery_monitor
+
     def demo(self):
         """Fade the on-board LED in and out"""
         from time import sleep_ms
-        pwm = machine.PWM(self.pin_out(self.BUILT_IN_LED), freq=100, duty=0)
+        pwm = self.pwm(self.BUILT_IN_LED, freq=100)
         SPEED = 4
         for duty in range(0, 1024, SPEED):
             pwm.duty(duty)
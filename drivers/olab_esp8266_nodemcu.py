@@ -2,11 +2,12 @@
 Pinout for the NodeMCU v2
 """
 
-from micropython import const
 import machine
 
+from .olab_board import Board
 
-class NodeMCU:
+
+class NodeMCU(Board):
     # PINs on the NodeMCU v2 board
     D0 = 16
     D1 = 5
@@ -24,25 +25,6 @@ class NodeMCU:
     BUILT_IN_LED_INV = 2  # NodeMCU on the ESP8266 uses inverted logic
     FLASH = 0
 
-    def pin_number(self, name):
-        if isinstance(name, int):
-            return name
-        else:
-            number = getattr(self, name)
-            if not isinstance(number, int):
-                raise KeyError(name)
-            return number
-
-    def pin_out(self, name):
-        number = self.pin_number(name)
-        Pin = machine.Pin
-        return Pin(number, Pin.OUT)
-
-    def pin_in(self, name):
-        number = self.pin_number(name)
-        Pin = machine.Pin
-        return Pin(number, Pin.IN, Pin.PULL_UP)
-
     def demo(self):
         """Fade the on-board LED in and out"""
         from time import sleep_ms
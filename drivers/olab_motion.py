@@ -0,0 +1,403 @@
+"""
+Precompiled motion programs
+
+A motion program is a list of timestamped commands for the drivers, packed
+into a `bytearray`. It can be built on the device or on a host computer
+(under CPython), saved to a file, and played back later.
+
+Building a program -- the methods mirror the driver APIs:
+
+    prog = MotionProgram([stepper1, motor1, servo1])
+    prog.speed(motor1, 0.8)
+    prog.value(servo1, 45)
+    prog.wait_ms(200)
+    prog.turn_steps(stepper1, 64, delay_ms=2)
+    prog.speed(motor1, 0)
+    prog.release(servo1)
+    prog.save('dance.bin')
+
+Playing it back against the actual devices (in the same order):
+
+    player = MotionPlayer([stepper1, motor1, servo1], prog)
+    player.play()
+
+Programs can also be streamed from a file, so they don't need to fit in RAM:
+
+    with open('dance.bin', 'rb') as f:
+        MotionPlayer([stepper1, motor1, servo1], f).play()
+
+`play()` blocks, and schedules each command with microsecond precision.
+Alternatively, `start(timer)` plays the program in the background from
+a `machine.Timer`; commands are then executed on the first timer tick after
+they are due.
+
+Each command is stored as 8 bytes: the time in microseconds since the
+previous command (uint32), the device index (uint8), the operation (uint8)
+and its argument (int16), all little-endian. Longer gaps than about
+4 minutes are split using "wait" commands, so the player can keep all times
+as `time.ticks_us` values.
+Stepper turns are stored as a single "run" command (with the number of steps),
+preceded by the interval between steps when it changes; the player schedules
+the individual steps.
+Decoding and scheduling use preallocated storage and small ints only.
+Running the commands does allocate: servo values are passed to the driver
+as floats, and the drivers themselves allocate. So, the garbage collector
+stays enabled. To keep collections out of tight sequences, `play()` runs
+`gc.collect()` whenever it has a few milliseconds to wait before the next
+command.
+"""
+
+try:
+    import ustruct
+except ImportError:
+    # Compiling programs on the host
+    import struct as ustruct
+import time
+import gc
+from array import array
+try:
+    from micropython import const
+except ImportError:
+    def const(value):
+        return value
+
+_RECORD_FORMAT = '<IBBh'
+_RECORD_SIZE = const(8)
+
+_OP_STEP = const(1)
+_OP_DUTY = const(2)
+_OP_VALUE = const(3)
+_OP_RELEASE = const(4)
+_OP_STEP_INTERVAL = const(5)
+_OP_STEPS = const(6)
+_OP_WAIT = const(7)
+
+# Longest time between commands; longer gaps are split with _OP_WAIT.
+# This keeps times well within the range of time.ticks_diff.
+_MAX_DELTA_US = const(0x0fffffff)
+
+# Step intervals are stored in units of 10 us
+_STEP_INTERVAL_UNIT_US = const(10)
+
+# Servo values are stored as fixed point, in hundredths
+_VALUE_SCALE = const(100)
+
+# Minimum wait before the next command for play() to collect garbage
+_GC_MIN_WAIT_US = const(10000)
+
+
+class MotionProgram:
+    def __init__(self, devices):
+        """
+        devices is a sequence of the devices the program will control.
+        The player must be given devices in the same order.
+        """
+        self.devices = list(devices)
+        self.data = bytearray()
+        self.time_us = 0
+        self._emitted_us = 0  # time of the last command
+        self._step_intervals = {}  # device index -> last emitted interval
+
+    def _index(self, device):
+        if isinstance(device, int):
+            return device
+        for index, candidate in enumerate(self.devices):
+            if candidate is device:
+                return index
+        raise ValueError('device is not part of the program')
+
+    def _emit(self, device, op, arg=0):
+        if not -0x8000 <= arg < 0x8000:
+            raise ValueError('argument out of range')
+        index = self._index(device)
+        delta = self.time_us - self._emitted_us
+        while delta > _MAX_DELTA_US:
+            self.data.extend(ustruct.pack(
+                _RECORD_FORMAT, _MAX_DELTA_US, 0, _OP_WAIT, 0,
+            ))
+            delta -= _MAX_DELTA_US
+        self.data.extend(ustruct.pack(_RECORD_FORMAT, delta, index, op, arg))
+        self._emitted_us = self.time_us
+
+    def wait_us(self, us):
+        """Advance the program's time by the given number of microseconds"""
+        if us < 0:
+            raise ValueError('cannot wait a negative time')
+        self.time_us += int(us)
+
+    def wait_ms(self, ms):
+        self.wait_us(ms * 1000)
+
+    def step(self, stepper, direction=1):
+        """Make a single step; see SM28BYJ48.step"""
+        self._emit(stepper, _OP_STEP, direction)
+
+    def turn_steps(self, stepper, steps, delay_ms=1):
+        """Turn the given amount of steps; see SM28BYJ48.turn_steps
+
+        Unlike the other commands, this advances the program's time
+        (by delay_ms per step).
+        """
+        index = self._index(stepper)
+        interval = int(delay_ms * 1000) // _STEP_INTERVAL_UNIT_US
+        if not 0 <= interval < 0x8000:
+            raise ValueError('step delay out of range')
+        if self._step_intervals.get(index) != interval:
+            self._emit(index, _OP_STEP_INTERVAL, interval)
+            self._step_intervals[index] = interval
+        steps = int(steps)
+        while steps:
+            count = max(-0x7fff, min(0x7fff, steps))
+            self._emit(index, _OP_STEPS, count)
+            self.wait_us(abs(count) * interval * _STEP_INTERVAL_UNIT_US)
+            steps -= count
+
+    def turn_degree(self, stepper, angle, delay_ms=1):
+        # 64 / 45 is a gearbox included in 28BYJ-48 step motor
+        self.turn_steps(stepper, angle * 8 * 64 / 45, delay_ms)
+
+    def duty(self, motor, duty):
+        """Set a motor's duty; see L293DMotor.duty"""
+        self._emit(motor, _OP_DUTY, int(duty))
+
+    def speed(self, motor, speed):
+        """Set a motor's speed; see L293DMotor.speed"""
+        self.duty(motor, int(speed * 1023))
+
+    def value(self, servo, value):
+        """Turn a servo to a given value; see SG90.value
+
+        The value is stored with a precision of 0.01, so it must be
+        between -327.68 and 327.67.
+        """
+        self._emit(servo, _OP_VALUE, round(value * _VALUE_SCALE))
+
+    def release(self, servo):
+        """Power a servo off; see SG90.release"""
+        self._emit(servo, _OP_RELEASE)
+
+    def save(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.data)
+
+
+class MotionPlayer:
+    def __init__(self, devices, program):
+        """
+        devices is a sequence of devices, in the same order as given to
+        the MotionProgram.
+
+        program is a MotionProgram, a buffer with its data, or a binary
+        file opened for reading.
+        """
+        if isinstance(program, MotionProgram):
+            program = program.data
+        self._devices = tuple(devices)
+        if hasattr(program, 'readinto'):
+            self._stream = program
+            self._data = None
+        else:
+            self._stream = None
+            self._data = memoryview(program)
+        self._record = bytearray(_RECORD_SIZE)
+        self._offset = 0
+        # The loaded command; _time is when it is due (in ticks_us)
+        self._pending = False
+        self._time = 0
+        self._device = 0
+        self._op = 0
+        self._arg = 0
+        # The next event, found by _next_due()
+        self._due_time = 0
+        self._due_device = -1
+        self._timer = None
+        self._tick_callback = self.tick
+        # Stepper runs, per device
+        count = len(self._devices)
+        self._step_interval = array('L', [0] * count)
+        self._step_time = array('L', [0] * count)
+        self._steps_left = array('L', [0] * count)
+        self._step_direction = array('b', [0] * count)
+        self._runs = 0
+
+    def _load(self):
+        """Decode the next command, or set _pending to False at the end"""
+        if self._stream is None:
+            data = self._data
+            offset = self._offset
+            if offset + _RECORD_SIZE > len(data):
+                self._pending = False
+                return
+            self._offset = offset + _RECORD_SIZE
+        else:
+            data = self._record
+            offset = 0
+            if self._stream.readinto(data) != _RECORD_SIZE:
+                self._pending = False
+                return
+        # The delta is at most _MAX_DELTA_US, so this stays a small int
+        delta = (
+            data[offset]
+            | data[offset + 1] << 8
+            | data[offset + 2] << 16
+            | data[offset + 3] << 24
+        )
+        self._time = time.ticks_add(self._time, delta)
+        self._device = data[offset + 4]
+        self._op = data[offset + 5]
+        arg = data[offset + 6] | data[offset + 7] << 8
+        if arg & 0x8000:
+            arg -= 0x10000
+        self._arg = arg
+        self._pending = True
+
+    def _execute(self):
+        op = self._op
+        if op == _OP_WAIT:
+            return
+        device = self._devices[self._device]
+        if op == _OP_STEP:
+            device.step(self._arg)
+        elif op == _OP_DUTY:
+            device.duty(self._arg)
+        elif op == _OP_VALUE:
+            device.value(self._arg / _VALUE_SCALE)
+        elif op == _OP_RELEASE:
+            device.release()
+        elif op == _OP_STEP_INTERVAL:
+            self._step_interval[self._device] = (
+                self._arg * _STEP_INTERVAL_UNIT_US
+            )
+        elif op == _OP_STEPS:
+            self._start_run()
+        else:
+            raise ValueError('unknown motion operation {}'.format(op))
+
+    def _start_run(self):
+        index = self._device
+        count = self._arg
+        if self._steps_left[index]:
+            self._runs -= 1
+        if count < 0:
+            self._step_direction[index] = -1
+            count = -count
+        else:
+            self._step_direction[index] = 1
+        self._steps_left[index] = count
+        self._step_time[index] = self._time
+        if count:
+            self._runs += 1
+
+    def _next_due(self):
+        """Find the next event; return False at the end of the program
+
+        Sets _due_time to when the event is due (in ticks_us), and
+        _due_device to the device whose step is due, or -1 if the next
+        event is a command.
+        """
+        found = self._pending
+        due = self._time
+        device = -1
+        if self._runs:
+            ticks_diff = time.ticks_diff
+            steps_left = self._steps_left
+            step_time = self._step_time
+            for index in range(len(steps_left)):
+                if not steps_left[index]:
+                    continue
+                if not found or ticks_diff(step_time[index], due) <= 0:
+                    found = True
+                    due = step_time[index]
+                    device = index
+        self._due_time = due
+        self._due_device = device
+        return found
+
+    def _run_due(self):
+        """Run the event found by the last _next_due() call"""
+        index = self._due_device
+        if index < 0:
+            self._execute()
+            self._load()
+            return
+        self._devices[index].step(self._step_direction[index])
+        steps_left = self._steps_left[index] - 1
+        self._steps_left[index] = steps_left
+        if steps_left:
+            self._step_time[index] = time.ticks_add(
+                self._step_time[index], self._step_interval[index],
+            )
+        else:
+            self._runs -= 1
+
+    def rewind(self):
+        """Go back to the start of the program
+
+        The program's time starts now.
+        """
+        self._offset = 0
+        if self._stream is not None:
+            self._stream.seek(0)
+        for index in range(len(self._devices)):
+            self._step_interval[index] = 0
+            self._steps_left[index] = 0
+        self._runs = 0
+        self._time = time.ticks_us()
+        self._load()
+
+    def play(self):
+        """Play the whole program, blocking until it is finished"""
+        self.stop()
+        gc.collect()
+        self.rewind()
+        while self._next_due():
+            wait = time.ticks_diff(self._due_time, time.ticks_us())
+            if wait > _GC_MIN_WAIT_US:
+                gc.collect()
+                wait = time.ticks_diff(self._due_time, time.ticks_us())
+            if wait > 0:
+                time.sleep_us(wait)
+            self._run_due()
+
+    def start(self, timer, period_ms=1):
+        """Play the program in the background, using the given machine.Timer
+
+        The timer is deinitialized when the program finishes.
+        """
+        import machine
+        self.stop()
+        gc.collect()
+        self.rewind()
+        self._timer = timer
+        timer.init(
+            period=period_ms, mode=machine.Timer.PERIODIC,
+            callback=self._tick_callback,
+        )
+
+    def tick(self, timer=None):
+        """Execute all commands that are due
+
+        Called periodically by the timer after start().
+        If a command fails, playback is stopped.
+        """
+        now = time.ticks_us()
+        try:
+            while True:
+                if not self._next_due():
+                    self.stop()
+                    break
+                if time.ticks_diff(self._due_time, now) > 0:
+                    break
+                self._run_due()
+        except BaseException:
+            self.stop()
+            raise
+
+    def stop(self):
+        """Stop background playback"""
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+
+    def is_playing(self):
+        return self._timer is not None
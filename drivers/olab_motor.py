@@ -13,11 +13,21 @@ encodes the direction as well as the PWM duty cycle.)
 Both `speed()` and `duty()` return the current value when called without
 arguments, and set it when called with an argument.
 
+The `speed_limit()` method caps the speed (e.g. when the battery is low);
+higher speeds are clamped to it.
+
 Motors are driven using PWM on the ENable pin. The pulse width will probably
 not have a linear correlation to the actual speed.
 (Speeds lower than about 0.3 might not even turn the motor on.)
 
 To deinitialize the motor driver, and free the PWM timer, call deinit().
+
+The PWM object is created by calling `pwm_factory(enable_pin, freq=freq,
+duty=0)`, by default `machine.PWM`. Pass a board's `pwm` method to share PWM
+timers with other devices. If the PWM object has a `max_duty` attribute
+(e.g. for a PCA9685 channel), duty values are scaled to it.
+The enable pin may be None if the factory handles that, e.g. a PCA9685 output
+from `RobotBoard.pwm`.
 """
 
 import machine
@@ -28,20 +38,28 @@ def _to_pin(pin):
     return pin
 
 class L293DMotor:
-    def __init__(self, enable_pin, pin_a, pin_b, freq=100):
+    def __init__(
+        self, enable_pin, pin_a, pin_b, freq=100, *, pwm_factory=None,
+    ):
         self._en = _to_pin(enable_pin)
         self._a = _to_pin(pin_a)
         self._b = _to_pin(pin_b)
         self._direction = 0
         self._pwm = None
-        self._freq = 100
+        self._pwm_factory = pwm_factory or machine.PWM
+        self._max_duty = 1024
+        self._freq = freq
+        self._duty_limit = 1023
+        self._requested_duty = 0  # last duty set, before applying the limit
 
     def deinit(self):
         """Turn the motor off and free resources"""
         if self._pwm:
             self._pwm.deinit()
         self._pwm = None
-        self._en(0)
+        self._requested_duty = 0
+        if self._en is not None:
+            self._en(0)
         self._a(0)
         self._b(0)
 
@@ -49,11 +67,18 @@ class L293DMotor:
         if duty is None:
             if self._pwm is None:
                 return 0
-            return self._pwm.duty() * (self._b() - self._a())
+            duty = self._pwm.duty() * 1024 // self._max_duty
+            return duty * (self._b() - self._a())
+        self._requested_duty = duty
+        limit = self._duty_limit
+        if duty > limit:
+            duty = limit
+        elif duty < -limit:
+            duty = -limit
         if self._pwm is None:
-            self._pwm = machine.PWM(self._en, freq=self._freq, duty=abs(duty))
-        else:
-            self._pwm.duty(abs(duty))
+            self._pwm = self._pwm_factory(self._en, freq=self._freq, duty=0)
+            self._max_duty = getattr(self._pwm, 'max_duty', 1024)
+        self._pwm.duty(abs(duty) * self._max_duty // 1024)
         self._a(duty < 0)
         self._b(duty > 0)
 
@@ -63,6 +88,18 @@ class L293DMotor:
         else:
             self.duty(int(speed * 1023))
 
+    def speed_limit(self, speed=None):
+        """Get or set the maximum speed (0 to 1)
+
+        The limit applies immediately. The last requested speed is
+        remembered, so raising the limit again restores it.
+        """
+        if speed is None:
+            return self._duty_limit / 1023
+        self._duty_limit = int(speed * 1023)
+        if self._pwm is not None:
+            self.duty(self._requested_duty)
+
     def on(self, speed=1):
         self.speed(speed)
 
@@ -0,0 +1,147 @@
+"""
+Opt-in profiling of driver methods
+
+Usage:
+
+    from drivers import olab_profile
+
+    olab_profile.enable()
+    devices.stepper1.demo()
+    devices.servo1.demo()
+    olab_profile.report()
+    olab_profile.disable()
+
+`enable()` replaces methods on the driver classes by wrappers that count
+calls and measure their duration using `time.ticks_us`. `disable()` puts
+the original methods back, so there is no overhead when profiling is off.
+
+By default, the drivers' hot paths are profiled (see `default_targets`).
+To profile other methods, pass a list of (class, method_name) pairs
+to `enable()`. At most 16 methods can be profiled at once.
+
+Counters are preallocated, so the wrappers don't allocate memory (except
+for the arguments of the call itself). To keep them in small ints, total
+times stop at 2**30 - 1 us (about 17.9 minutes); `report()` marks such
+totals (and their averages) with `+`.
+Times include any sleeping the methods do, and they are inclusive:
+e.g. `SM28BYJ48.turn_steps` includes the time spent in `SM28BYJ48.step`.
+Calls that raise an exception are not counted.
+"""
+
+import time
+from array import array
+from micropython import const
+
+_MAX_TARGETS = const(16)
+_MAX_TOTAL = const(0x3fffffff)  # largest small int on 32-bit ports
+
+_counts = array('L', [0] * _MAX_TARGETS)
+_totals = array('L', [0] * _MAX_TARGETS)
+_maxima = array('L', [0] * _MAX_TARGETS)
+_targets = []  # (class, method name, original function)
+_names = []  # 'Class.method' for each counter in use
+
+
+def default_targets():
+    """Return (class, method_name) pairs for the drivers' hot paths"""
+    from .olab_stepper import SM28BYJ48
+    from .olab_io_expander import PCF8574
+    from .olab_pwm_driver import PCA9685
+    from .olab_servo import SG90
+    from .olab_motor import L293DMotor
+    return [
+        (SM28BYJ48, 'turn_steps'),
+        (SM28BYJ48, 'step'),
+        (PCF8574, 'write_bits'),
+        (PCF8574, 'read_bits'),
+        (PCA9685, 'pwm'),
+        (PCA9685, 'duty'),
+        (SG90, 'value'),
+        (SG90, '__call__'),
+        (L293DMotor, 'duty'),
+    ]
+
+
+def _wrap(function, slot):
+    ticks_us = time.ticks_us
+    ticks_diff = time.ticks_diff
+
+    def wrapper(*args, **kwargs):
+        start = ticks_us()
+        result = function(*args, **kwargs)
+        elapsed = ticks_diff(ticks_us(), start)
+        _counts[slot] += 1
+        total = _totals[slot]
+        if total < _MAX_TOTAL - elapsed:
+            _totals[slot] = total + elapsed
+        else:
+            _totals[slot] = _MAX_TOTAL
+        if elapsed > _maxima[slot]:
+            _maxima[slot] = elapsed
+        return result
+
+    return wrapper
+
+
+def enable(targets=None):
+    """Start profiling the given methods (by default, default_targets())
+
+    Counters are reset.
+    """
+    disable()
+    if targets is None:
+        targets = default_targets()
+    if len(targets) > _MAX_TARGETS:
+        raise ValueError('at most {} methods can be profiled'.format(
+            _MAX_TARGETS,
+        ))
+    reset()
+    del _names[:]
+    for slot, (cls, name) in enumerate(targets):
+        original = getattr(cls, name)
+        _targets.append((cls, name, original))
+        _names.append(cls.__name__ + '.' + name)
+        setattr(cls, name, _wrap(original, slot))
+
+
+def disable():
+    """Stop profiling, restoring the original methods
+
+    Counters are kept, so report() can be called afterwards.
+    """
+    while _targets:
+        cls, name, original = _targets.pop()
+        setattr(cls, name, original)
+
+
+def is_enabled():
+    return bool(_targets)
+
+
+def reset():
+    """Reset all counters"""
+    for slot in range(_MAX_TARGETS):
+        _counts[slot] = 0
+        _totals[slot] = 0
+        _maxima[slot] = 0
+
+
+def report():
+    """Print the number of calls and time spent for each profiled method"""
+    print('{:<28} {:>8} {:>10} {:>8} {:>8}'.format(
+        'method', 'calls', 'total_us', 'avg_us', 'max_us',
+    ))
+    for slot, name in enumerate(_names):
+        count = _counts[slot]
+        total = _totals[slot]
+        if count:
+            average = total // count
+        else:
+            average = 0
+        if total >= _MAX_TOTAL:
+            # Saturated: these are lower bounds
+            total = str(total) + '+'
+            average = str(average) + '+'
+        print('{:<28} {:>8} {:>10} {:>8} {:>8}'.format(
+            name, count, total, average, _maxima[slot],
+        ))
@@ -0,0 +1,168 @@
+"""
+PWM timer/channel allocator for the ESP32
+
+The ESP32 generates PWM using a limited number of channels, driven by
+an even smaller number of timers. Each timer runs at a single frequency,
+so all users of a timer must agree on the frequency.
+
+The allocator hands out PWM objects, sharing one timer between all users
+of the same frequency, and raises RuntimeError with a description of what
+is in use when channels or timers run out.
+
+PCA9685 controllers can be added to get more channels. A channel of
+a PCA9685 is handed out when no pin is given (the device must be connected
+to that channel, of course). The controller's frequency is set by its first
+user; afterwards, only users of the same frequency can share it.
+
+Example:
+
+    allocator = PWMAllocator()
+    allocator.add_fallback(PCA9685(i2c))
+
+    # native PWM on pin 17
+    pwm = allocator.pwm(machine.Pin(17), freq=50)
+
+    # next free PCA9685 channel
+    pwm = allocator.pwm(None, freq=50)
+    print(pwm.index)
+
+    pwm.deinit()  # free the channel
+
+The returned objects have `duty`, `freq` and `deinit` methods, and
+a `max_duty` attribute: the duty value that means 100% (1024 for native
+PWM, 4096 for PCA9685). The frequency can be read but not changed.
+
+The allocator only does bookkeeping; it does not control which hardware
+timer the firmware picks. Its limits must match the firmware. The defaults
+(8 channels, 4 timers) match older ESP32 MicroPython firmware, which uses
+only the LEDC high-speed group. Newer firmware uses both speed groups on
+the original ESP32, giving 16 channels and 8 timers; pass
+`max_channels=16, max_timers=8` for it.
+Other chips (ESP32-S2, -C3, ...) have fewer channels.
+
+`RobotBoard.pwm` uses a shared allocator for the board; its limits can be
+set with `RobotBoard.get_pwm_allocator`.
+"""
+
+import machine
+
+
+class AllocatedPWM:
+    def __init__(self, allocator, pwm, freq, max_duty, index=None):
+        self._allocator = allocator
+        self._pwm = pwm
+        self._freq = freq
+        self.max_duty = max_duty
+        self.index = index
+        # Bypass a level of indirection on the hot path
+        self.duty = pwm.duty
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        else:
+            raise TypeError('frequency of an allocated PWM cannot be changed')
+
+    def deinit(self):
+        """Turn the output off and free the channel"""
+        if self._allocator is not None:
+            self._allocator._release(self)
+            self._allocator = None
+
+    def __repr__(self):
+        if self.index is None:
+            kind = 'native'
+        else:
+            kind = 'PCA9685[{}]'.format(self.index)
+        return '<AllocatedPWM {} @ {} Hz>'.format(kind, self._freq)
+
+
+class _Fallback:
+    def __init__(self, controller, channels, freq):
+        self.controller = controller
+        self.channels = channels
+        self.free = list(channels)
+        self.freq = freq
+
+
+class PWMAllocator:
+    def __init__(self, max_channels=8, max_timers=4):
+        """
+        max_channels and max_timers are the numbers of PWM channels and
+        timers the firmware provides (see the module docstring).
+        """
+        self.max_channels = max_channels
+        self.max_timers = max_timers
+        self._channels = 0
+        self._timers = {}  # frequency -> number of channels using it
+        self._fallbacks = []
+
+    def add_fallback(self, controller, channels=range(16)):
+        """Add a PCA9685 controller to use when no pin is given
+
+        `channels` are the indices of the controller's outputs that may
+        be handed out.
+        """
+        self._fallbacks.append(
+            _Fallback(controller, channels, controller.freq()),
+        )
+
+    def pwm(self, pin, freq, duty=0):
+        """Get a PWM object
+
+        If `pin` is None, a PCA9685 channel is used.
+        The initial `duty` is given in 1/1024 units.
+        """
+        if pin is None:
+            return self._fallback_pwm(freq, duty)
+        if self._channels >= self.max_channels:
+            raise RuntimeError(
+                'no free PWM channel (all {} in use)'.format(self.max_channels)
+            )
+        users = self._timers.get(freq, 0)
+        if not users and len(self._timers) >= self.max_timers:
+            raise RuntimeError(
+                'no free PWM timer for {} Hz (in use: {} Hz)'.format(
+                    freq, ', '.join(str(f) for f in self._timers),
+                )
+            )
+        pwm = machine.PWM(pin, freq=freq, duty=duty)
+        self._timers[freq] = users + 1
+        self._channels += 1
+        return AllocatedPWM(self, pwm, freq, 1024)
+
+    def _fallback_pwm(self, freq, duty):
+        for fallback in self._fallbacks:
+            if not fallback.free:
+                continue
+            in_use = len(fallback.free) < len(fallback.channels)
+            if abs(fallback.freq - freq) > 1:
+                if in_use:
+                    continue
+                fallback.controller.freq(freq)
+                fallback.freq = freq
+            index = fallback.free.pop(0)
+            channel = fallback.controller[index]
+            max_duty = channel.max_duty
+            channel.duty(duty * max_duty // 1024)
+            return AllocatedPWM(self, channel, freq, max_duty, index)
+        raise RuntimeError(
+            'no free PCA9685 channel for {} Hz'.format(freq)
+        )
+
+    def _release(self, allocated):
+        pwm = allocated._pwm
+        if allocated.index is None:
+            pwm.deinit()
+            freq = allocated._freq
+            users = self._timers[freq] - 1
+            if users:
+                self._timers[freq] = users
+            else:
+                del self._timers[freq]
+            self._channels -= 1
+        else:
+            pwm.duty(0)
+            for fallback in self._fallbacks:
+                if fallback.controller is pwm.controller:
+                    fallback.free.append(allocated.index)
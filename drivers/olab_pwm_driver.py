@@ -21,41 +21,42 @@ Note that the frequency is shared and cannot be set on the individual PWMs.
 
 import ustruct
 import time
+from micropython import const
 
-MODE1 = const(0x00)
-MODE2 = const(0x01)
-SUBADDR1 = const(0x02)
-SUBADDR2 = const(0x03)
-SUBADDR3 = const(0x04)
-ALLCALLADDR = const(0x05)
-ONOFF = const(0x06)
-PRE_SCALE = const(0xfe)
-TEST_MODE = const(0xff)
+_MODE1 = const(0x00)
+_MODE2 = const(0x01)
+_SUBADDR1 = const(0x02)
+_SUBADDR2 = const(0x03)
+_SUBADDR3 = const(0x04)
+_ALLCALLADDR = const(0x05)
+_ONOFF = const(0x06)
+_PRE_SCALE = const(0xfe)
+_TEST_MODE = const(0xff)
 
-MODE1_ALLCALL = const(0x01)
-MODE1_SUB3 = const(0x02)
-MODE1_SUB2 = const(0x04)
-MODE1_SUB1 = const(0x08)
-MODE1_SLEEP = const(0x10)
-MODE1_AI = const(0x20)
-MODE1_EXTCLK = const(0x40)
-MODE1_RESTART = const(0x80)
+_MODE1_ALLCALL = const(0x01)
+_MODE1_SUB3 = const(0x02)
+_MODE1_SUB2 = const(0x04)
+_MODE1_SUB1 = const(0x08)
+_MODE1_SLEEP = const(0x10)
+_MODE1_AI = const(0x20)
+_MODE1_EXTCLK = const(0x40)
+_MODE1_RESTART = const(0x80)
 
-MODE2_OUTNE0 = const(0x01)
-MODE2_OUTNE1 = const(0x02)
-MODE2_OUTDRV = const(0x04)
-MODE2_OCH = const(0x08)
-MODE2_INVRT = const(0x10)
+_MODE2_OUTNE0 = const(0x01)
+_MODE2_OUTNE1 = const(0x02)
+_MODE2_OUTDRV = const(0x04)
+_MODE2_OCH = const(0x08)
+_MODE2_INVRT = const(0x10)
 
-ONOFF_ALWAYS = const(0x1000)
+_ONOFF_ALWAYS = const(0x1000)
 
-MAX_DUTY = const(0x1000)
+_MAX_DUTY = const(0x1000)
 
-OSCILLATOR_FREQ = 25000000
+_OSCILLATOR_FREQ = const(25000000)
 
 
 class PCA9685:
-    max_duty = MAX_DUTY
+    max_duty = _MAX_DUTY
 
     def __init__(self, i2c, address=0x40, freq=None):
         self.i2c = i2c
@@ -71,60 +72,60 @@ class PCA9685:
         return self.i2c.readfrom_mem(self.address, address, 1)[0]
 
     def reset(self):
-        self._write(MODE1, MODE1_AI)
+        self._write(_MODE1, _MODE1_AI)
 
     def freq(self, freq=None):
         """Set or read the frequency in Hz"""
         if freq is None:
-            return int(OSCILLATOR_FREQ / MAX_DUTY / (self._read(PRE_SCALE) - 0.5))
-        prescale = int(OSCILLATOR_FREQ / MAX_DUTY / freq + 0.5)
-        old_mode = self._read(MODE1)
-        self._write(MODE1, (old_mode & ~MODE1_SLEEP) | MODE1_SLEEP)
-        self._write(PRE_SCALE, prescale)
-        self._write(MODE1, old_mode)
+            return int(_OSCILLATOR_FREQ / _MAX_DUTY / (self._read(_PRE_SCALE) - 0.5))
+        prescale = int(_OSCILLATOR_FREQ / _MAX_DUTY / freq + 0.5)
+        old_mode = self._read(_MODE1)
+        self._write(_MODE1, (old_mode & ~_MODE1_SLEEP) | _MODE1_SLEEP)
+        self._write(_PRE_SCALE, prescale)
+        self._write(_MODE1, old_mode)
         time.sleep_us(5)
-        self._write(MODE1, old_mode | MODE1_RESTART | MODE1_AI)
+        self._write(_MODE1, old_mode | _MODE1_RESTART | _MODE1_AI)
 
     def pwm(self, index, on=None, off=None):
         """Set the on & off time (12-bit values + 1 always-on/off bit)"""
         if on is None or off is None:
-            data = self.i2c.readfrom_mem(self.address, ONOFF + 4 * index, 4)
+            data = self.i2c.readfrom_mem(self.address, _ONOFF + 4 * index, 4)
             return ustruct.unpack('<HH', data)
         data = ustruct.pack('<HH', on, off)
-        self.i2c.writeto_mem(self.address, ONOFF + 4 * index,  data)
+        self.i2c.writeto_mem(self.address, _ONOFF + 4 * index,  data)
 
     def duty(self, index, value=None):
         if value is None:
             on, off = self.pwm(index)
-            if off & ONOFF_ALWAYS:
+            if off & _ONOFF_ALWAYS:
                 return 0
-            if on & ONOFF_ALWAYS:
-                return MAX_DUTY
-            value = on - off
+            if on & _ONOFF_ALWAYS:
+                return _MAX_DUTY
+            value = off - on
             if value < 0:
-                value += MAX_DUTY
+                value += _MAX_DUTY
             return value
-        if not 0 <= value <= MAX_DUTY:
+        if not 0 <= value <= _MAX_DUTY:
             raise ValueError("duty out of range")
         if value == 0:
-            self.pwm(index, 0, ONOFF_ALWAYS)
-        elif value == MAX_DUTY:
-            self.pwm(index, ONOFF_ALWAYS, 0)
+            self.pwm(index, 0, _ONOFF_ALWAYS)
+        elif value == _MAX_DUTY:
+            self.pwm(index, _ONOFF_ALWAYS, 0)
         else:
             self.pwm(index, 0, value)
 
     def duty_fraction(self, index, value=None):
         if value is None:
-            return self.duty(index) / MAX_DUTY
+            return self.duty(index) / _MAX_DUTY
         else:
-            self.duty(index, int(value * MAX_DUTY))
+            self.duty(index, int(value * _MAX_DUTY))
 
     def __getitem__(self, index):
         return PWMChannel(self, index)
 
 
 class PWMChannel:
-    max_duty = MAX_DUTY
+    max_duty = _MAX_DUTY
 
     def __init__(self, controller, index):
         self.controller = controller
@@ -11,6 +11,8 @@ Can be initialized in several ways:
   If `max_duty` is given, it will be used as the value representing 100%
   duty cycle.
   Otherwise, it is read from `pwm.max_duty`, falling back to 1024.
+  To share PWM timers with other devices, use a PWM object from
+  a board's `pwm` method, e.g. `SG90(pwm=board.pwm('PWM1', freq=50))`.
 
 Use the `value()` method to turn the servo to a given value.
 
@@ -36,8 +38,8 @@ class SG90:
         if pin is not None:
             if pwm is not None:
                 raise ValueError('pin, pwm are mutually exclusive')
-            if isinstance(pwm, int):
-                pwm = machine.Pin(pwm, machine.Pin.OUT)
+            if isinstance(pin, int):
+                pin = machine.Pin(pin, machine.Pin.OUT)
             freq = freq or 50
             self._pwm = machine.PWM(pin, freq=freq, duty=0)
             max_duty = max_duty or 1024
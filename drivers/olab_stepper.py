@@ -17,7 +17,7 @@ STEP_ELEMENTS = (
     const(0b1000),
     const(0b1001)
 )
-N_STEP_ELEMENTS = const(8)
+_N_STEP_ELEMENTS = const(8)
 
 
 class SM28BYJ48:
@@ -43,11 +43,18 @@ class SM28BYJ48:
         else:
             direction = 1
         for _ in range(abs(int(steps))):
-            self.current_step += direction
-            element = STEP_ELEMENTS[self.current_step % N_STEP_ELEMENTS ]
-            self.set_bits(element)
+            self.step(direction)
             time.sleep_ms(delay_ms)
 
+    def step(self, direction=1):
+        """Make a single step (1 = clockwise, -1 = counter-clockwise)
+
+        Unlike turn_steps, this does not wait for the motor to move.
+        """
+        self.current_step += direction
+        element = STEP_ELEMENTS[self.current_step % _N_STEP_ELEMENTS]
+        self.set_bits(element)
+
     def turn_degree(self, angle, ccw=False):
         # 64 / 45 is a gearbox included in 28BYJ-48 step motor
         step_count = angle * 8 * 64 / 45
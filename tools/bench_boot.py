@@ -0,0 +1,79 @@
+"""
+Measure the import time and heap use of each driver module
+
+Run with the MicroPython Unix port, from the repository root:
+
+    micropython tools/bench_boot.py
+
+The Unix port's `machine` module has no Pin, PWM or I2C, but the drivers
+only use those when devices are created, so all modules can be imported.
+
+Each module is imported on its own, after its dependencies, so the numbers
+don't include them. The modules loaded when booting with `devices.py` are
+also summed up separately. Times include compiling the source; on a device,
+precompiling with mpy-cross makes imports faster.
+"""
+
+import gc
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+# Dependencies come first
+MODULES = (
+    'olab_board',
+    'olab_esp32_robot_board',
+    'olab_esp8266_nodemcu',
+    'olab_io_expander',
+    'olab_stepper',
+    'olab_motor',
+    'olab_servo',
+    'olab_pwm_driver',
+    'olab_pwm_allocator',
+    'olab_battery',
+    'olab_motion',
+    'olab_profile',
+)
+
+# Modules loaded by devices.py (including the package and dependencies)
+DEVICES_PATH = (
+    'drivers',
+    'drivers.olab_board',
+    'drivers.olab_esp32_robot_board',
+    'drivers.olab_io_expander',
+    'drivers.olab_stepper',
+    'drivers.olab_motor',
+    'drivers.olab_servo',
+    'drivers.olab_pwm_allocator',
+)
+
+
+def measure(name):
+    """Import a module; return the time taken (us) and heap used (bytes)"""
+    gc.collect()
+    free = gc.mem_free()
+    start = time.ticks_us()
+    __import__(name)
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    gc.collect()
+    return elapsed, free - gc.mem_free()
+
+
+def main():
+    print('{:<28} {:>8} {:>8}'.format('module', 'us', 'bytes'))
+    total_time = total_mem = 0
+    boot_time = boot_mem = 0
+    for name in ('drivers',) + tuple('drivers.' + m for m in MODULES):
+        elapsed, used = measure(name)
+        total_time += elapsed
+        total_mem += used
+        if name in DEVICES_PATH:
+            boot_time += elapsed
+            boot_mem += used
+        print('{:<28} {:>8} {:>8}'.format(name, elapsed, used))
+    print('{:<28} {:>8} {:>8}'.format('devices.py path', boot_time, boot_mem))
+    print('{:<28} {:>8} {:>8}'.format('total', total_time, total_mem))
+
+
+main()